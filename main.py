@@ -1,8 +1,18 @@
+import argparse
 import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from pprint import pprint
-from datetime import datetime
+from datetime import date
 
 from nautilus_trader.backtest.config import (
     BacktestDataConfig,
@@ -11,10 +21,10 @@ from nautilus_trader.backtest.config import (
     BacktestVenueConfig,
 )
 from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.backtest.results import BacktestResult
 from nautilus_trader.config import ImportableStrategyConfig
 from nautilus_trader.config import LoggingConfig, RiskEngineConfig
 from nautilus_trader.persistence.catalog import ParquetDataCatalog
-from nautilus_trader.persistence.wranglers import BarDataWrangler
 from nautilus_trader.model.enums import (
     PriceType,
     BarAggregation,
@@ -24,41 +34,86 @@ from nautilus_trader.model.data import Bar, BarType, BarSpecification
 from nautilus_trader.model.instruments.base import Instrument
 from nautilus_trader.test_kit.providers import TestInstrumentProvider
 from nautilus_trader.persistence.config import DataCatalogConfig
-from utils.binance_data import get_combined_dataframe
+from utils.binance_data import close_session, get_combined_dataframe
+from utils.catalog import (
+    bars_df_to_arrow,
+    bars_files,
+    is_catalog_valid,
+    open_parquet,
+    write_bars,
+    write_catalog_meta,
+)
 from nautilus_trader.config import DataEngineConfig
 
+# Configs are immutable, so every run config (and sweep run) shares this one
+_DATA_ENGINE_CFG = DataEngineConfig(
+    time_bars_origins={
+        BarAggregation.HOUR: pd.Timedelta(0),
+    },
+)
+
 
-def create_bars_from_df(
+def iter_bar_batches(
     df: pd.DataFrame,
     instrument: Instrument,
     bar_type: BarType,
-) -> list[Bar]:
-    # Read CSV and convert open_time to datetime index
-    df["timestamp"] = pd.to_datetime(df["open_time"], unit="ms")
-    df.set_index("timestamp", inplace=True)
+    chunk: str = "M",
+) -> Iterator[pa.RecordBatch]:
+    # Split on calendar periods (monthly by default) of the sorted open_time column,
+    # so only one chunk is converted at a time
+    periods = (
+        df["open_time"].to_numpy().view("datetime64[ms]").astype(f"datetime64[{chunk}]")
+    )
+    bounds = [0, *(np.flatnonzero(periods[1:] != periods[:-1]) + 1), len(df)]
 
-    # Select and rename required columns
-    df = df[["open", "high", "low", "close", "volume"]]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        yield bars_df_to_arrow(df.iloc[start:stop], instrument, bar_type)
 
-    wrangler = BarDataWrangler(bar_type=bar_type, instrument=instrument)
-    bars = wrangler.process(data=df)
 
-    return bars
+def bars_head(catalog: ParquetDataCatalog, bar_type: BarType, n: int = 5) -> list[int]:
+    # Read only the first batch of ts_init values instead of decoding every bar
+    files = bars_files(catalog, bar_type)
+    if not files:
+        return []
 
+    parquet_file = open_parquet(catalog, files[0])
+    batch = next(parquet_file.iter_batches(batch_size=n, columns=["ts_init"]), None)
 
-async def run_backtest(
+    return [] if batch is None else batch.column("ts_init").to_pylist()
+
+
+def catalog_key(symbol: str, interval: str, start_date: str, end_date: str) -> str:
+    # Stable key for the inputs that determine the catalog contents
+    key = f"{symbol}-{interval}-{start_date}-{end_date}"
+    return hashlib.blake2b(key.encode()).hexdigest()[:16]
+
+
+def peak_rss_mb() -> float | None:
+    # Peak resident set size of this process, or None where the resource module
+    # is unavailable (Windows)
+    if sys.platform == "win32":
+        return None
+
+    import resource
+
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor
+
+
+async def prepare_backtest(
     quote_symbol: str,
     base_symbol: str,
     start_date: str,
     end_date: str,
     backtest_start_date: str | None = None,
     interval: str = "1h",
-):
+) -> tuple[ParquetDataCatalog, Instrument, BarType]:
     # Validate backtest_start_date if provided
     if backtest_start_date is not None:
-        start = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end = datetime.strptime(end_date, "%Y-%m-%d").date()
-        backtest_start = datetime.strptime(backtest_start_date, "%Y-%m-%d").date()
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        backtest_start = date.fromisoformat(backtest_start_date)
 
         if not (start <= backtest_start <= end):
             raise ValueError(
@@ -71,16 +126,6 @@ async def run_backtest(
 
     symbol = f"{quote_symbol}{base_symbol}"
 
-    # Set up the catalog for storing data
-    catalog_path = Path("catalog")
-    if catalog_path.exists():
-        import shutil
-
-        shutil.rmtree(catalog_path)
-    catalog_path.mkdir()
-
-    catalog = ParquetDataCatalog(str(catalog_path))
-
     # Instruments define the trading pair on a given exchange
     # Include info like symbol, size precision, price precision, maker/taker fee, etc.
     instrument = TestInstrumentProvider.btcusdt_perp_binance()
@@ -105,28 +150,82 @@ async def run_backtest(
         aggregation_source=AggregationSource.EXTERNAL,
     )
 
-    combined_df = await get_combined_dataframe(
-        symbol=symbol,
-        interval=interval,
-        start_date=start_date,
-        end_date=end_date,
-    )
+    # Set up the catalog for storing data, keyed by the inputs so that repeated
+    # runs over the same data reuse it instead of downloading and converting again
+    catalog_path = Path("catalog") / catalog_key(symbol, interval, start_date, end_date)
+    catalog = ParquetDataCatalog(str(catalog_path))
 
-    # Create bar data
-    bars = create_bars_from_df(
-        df=combined_df,
-        instrument=instrument,
-        bar_type=bar_type,
-    )
+    if is_catalog_valid(catalog, instrument, bar_type):
+        print(f"Reusing catalog at {catalog_path}")
+    else:
+        if catalog_path.exists():
+            import shutil
+
+            shutil.rmtree(catalog_path)
+        catalog_path.mkdir(parents=True)
+
+        try:
+            combined_df = await get_combined_dataframe(
+                symbol=symbol,
+                interval=interval,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        finally:
+            await close_session()
+
+        # A day without klines (e.g. a download that failed) leaves a gap in the
+        # bars, so the catalog is only marked reusable when every day has data
+        days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+        days_missing = days - len(
+            np.unique(combined_df["open_time"].to_numpy() // 86_400_000)
+        )
 
-    catalog.write_data([instrument])
-    catalog.write_data(bars)
+        catalog.write_data([instrument])
+
+        # Convert bar data to Arrow one chunk at a time and write it directly to
+        # parquet, so peak memory is bounded by the chunk size rather than the whole dataset
+        rows = write_bars(
+            catalog=catalog,
+            batches=iter_bar_batches(
+                df=combined_df,
+                instrument=instrument,
+                bar_type=bar_type,
+            ),
+            instrument=instrument,
+            bar_type=bar_type,
+        )
+        del combined_df
+
+        if days_missing:
+            print(
+                f"No data for {days_missing} of {days} days, the catalog will be "
+                "rebuilt on the next run"
+            )
+        else:
+            # Written last, so an interrupted write is never mistaken for a complete
+            # catalog
+            write_catalog_meta(catalog, instrument, bar_type, rows)
 
     # Print first 5 bar timestamps
     print("\nFirst 5 bar timestamps:")
-    for i, bar in enumerate(catalog.bars(bar_types=[str(bar_type)])[:5]):
-        print(f"Bar {i + 1}: {bar.ts_init}")
+    for i, ts_init in enumerate(bars_head(catalog, bar_type, n=5)):
+        print(f"Bar {i + 1}: {ts_init}")
+
+    return catalog, instrument, bar_type
+
 
+def build_run_config(
+    catalog: ParquetDataCatalog,
+    instrument: Instrument,
+    bar_type: BarType,
+    start_date: str,
+    end_date: str,
+    backtest_start_date: str | None = None,
+    fast_ema_period: int = 10,
+    slow_ema_period: int = 20,
+    log_file_name: str = "backtest",
+) -> BacktestRunConfig:
     # Configure the backtest data
     # Represents the data configuration for one specific backtest run.
     # Note: It's possible to use instrument_ids and bar_types instead of instrument_id and bar_spec
@@ -134,7 +233,7 @@ async def run_backtest(
         catalog_path=catalog.path,
         data_cls=Bar,
         instrument_id=instrument.id,
-        bar_spec=bar_spec,
+        bar_spec=bar_type.spec,
     )
 
     catalogs = [
@@ -169,21 +268,16 @@ async def run_backtest(
                 "bar_type": bar_type,
                 "trade_size": 0.01,
                 "atr_period": 20,
-                "fast_ema_period": 10,
-                "slow_ema_period": 20,
+                "fast_ema_period": fast_ema_period,
+                "slow_ema_period": slow_ema_period,
                 "bracket_distance_atr": 3.0,
                 "historical_start_time": start_date,
                 "historical_end_time": backtest_start_date,
+                "catalog_path": catalog.path,
             },
         ),
     ]
 
-    data_engine = DataEngineConfig(
-        time_bars_origins={
-            BarAggregation.HOUR: pd.Timedelta(seconds=0),
-        },
-    )
-
     logging = LoggingConfig(
         bypass_logging=False,
         log_colors=True,
@@ -191,7 +285,7 @@ async def run_backtest(
         log_level_file="DEBUG",
         log_directory="logs",
         log_file_format=None,  # "json" or None
-        log_file_name="backtest",
+        log_file_name=log_file_name,
         clear_log_file=True,
         print_config=False,
         use_pyo3=False,
@@ -237,16 +331,50 @@ async def run_backtest(
             bypass=True,  # Example of bypassing pre-trade risk checks for backtests
         ),
         catalogs=catalogs,
-        data_engine=data_engine,
+        data_engine=_DATA_ENGINE_CFG,
     )
 
     # Create backtest configuration
+    # chunk_size streams the data from the catalog in chunks of that many data points
+    # instead of loading it all into the engine up front, which keeps memory flat as
+    # the dataset grows. Raise it for fewer, larger reads; lower it for tick data
+    # (None loads everything at once)
     config = BacktestRunConfig(
         engine=backtest_engine_config,
         data=[data_config],
         venues=[venue_config],
         start=backtest_start_date,
         end=end_date,
+        chunk_size=100_000,
+    )
+
+    return config
+
+
+async def run_backtest(
+    quote_symbol: str,
+    base_symbol: str,
+    start_date: str,
+    end_date: str,
+    backtest_start_date: str | None = None,
+    interval: str = "1h",
+):
+    symbol = f"{quote_symbol}{base_symbol}"
+    catalog, instrument, bar_type = await prepare_backtest(
+        quote_symbol=quote_symbol,
+        base_symbol=base_symbol,
+        start_date=start_date,
+        end_date=end_date,
+        backtest_start_date=backtest_start_date,
+        interval=interval,
+    )
+    config = build_run_config(
+        catalog=catalog,
+        instrument=instrument,
+        bar_type=bar_type,
+        start_date=start_date,
+        end_date=end_date,
+        backtest_start_date=backtest_start_date,
     )
 
     # Create backtest node
@@ -254,7 +382,10 @@ async def run_backtest(
 
     # Run the backtest
     print(f"Running backtest for {symbol} from {backtest_start_date} to {end_date}...")
+    rss_before = peak_rss_mb()
     results = node.run()
+    if rss_before is not None:
+        print(f"Peak RSS: {rss_before:.1f} MB before run, {peak_rss_mb():.1f} MB after")
 
     # Generate reports
     print("Generating reports...")
@@ -279,10 +410,84 @@ async def run_backtest(
     return results
 
 
+def run_configs(configs: list[BacktestRunConfig]) -> list[BacktestResult]:
+    # Runs in a worker process of the sweep; each process reads the catalog files
+    # itself, so no bar data is serialized between processes
+    return BacktestNode(configs=configs).run()
+
+
+async def run_sweep(
+    quote_symbol: str,
+    base_symbol: str,
+    start_date: str,
+    end_date: str,
+    backtest_start_date: str | None = None,
+    interval: str = "1h",
+    fast_ema_periods: tuple[int, ...] = (5, 10, 20),
+    slow_ema_periods: tuple[int, ...] = (20, 50, 100),
+    max_workers: int | None = None,
+) -> list[BacktestResult]:
+    catalog, instrument, bar_type = await prepare_backtest(
+        quote_symbol=quote_symbol,
+        base_symbol=base_symbol,
+        start_date=start_date,
+        end_date=end_date,
+        backtest_start_date=backtest_start_date,
+        interval=interval,
+    )
+
+    # One run per EMA period pair. Nautilus sets up logging once per process, so
+    # each worker logs to the file named by the first run it picks up
+    configs = [
+        build_run_config(
+            catalog=catalog,
+            instrument=instrument,
+            bar_type=bar_type,
+            start_date=start_date,
+            end_date=end_date,
+            backtest_start_date=backtest_start_date,
+            fast_ema_period=fast,
+            slow_ema_period=slow,
+            log_file_name=f"backtest_{fast}_{slow}",
+        )
+        for fast in fast_ema_periods
+        for slow in slow_ema_periods
+        if fast < slow
+    ]
+
+    # One run per task, so a worker picks up the next run as soon as it is free.
+    # Workers are spawned rather than forked, as the Rust runtime threads in the
+    # parent don't survive a fork
+    workers = min(max_workers or os.cpu_count(), len(configs))
+
+    print(f"Running {len(configs)} backtests on {workers} processes...")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        return [
+            result
+            for results in executor.map(run_configs, ([config] for config in configs))
+            for result in results
+        ]
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Run a parallel sweep over EMA periods instead of a single backtest",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    run = run_sweep if args.sweep else run_backtest
+
     # Run the backtest
     results = asyncio.run(
-        run_backtest(
+        run(
             base_symbol="USDT",
             quote_symbol="BTC",
             interval="1h",
@@ -16,6 +16,8 @@
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+import numpy as np
+
 from nautilus_trader.common.enums import LogColor
 from nautilus_trader.config import PositiveFloat
 from nautilus_trader.config import PositiveInt
@@ -34,9 +36,16 @@ from nautilus_trader.model.enums import TimeInForce
 from nautilus_trader.model.enums import TriggerType
 from nautilus_trader.model.identifiers import InstrumentId
 from nautilus_trader.model.instruments import Instrument
+from nautilus_trader.model.objects import Price
+from nautilus_trader.model.objects import Quantity
 from nautilus_trader.model.orders.list import OrderList
+from nautilus_trader.persistence.catalog import ParquetDataCatalog
 from nautilus_trader.trading.strategy import Strategy
 
+from strategies._kernels import ema_atr_signal
+from utils.catalog import fixed_to_float
+from utils.catalog import read_bars_table
+
 
 # *** THIS IS A TEST STRATEGY WITH NO ALPHA ADVANTAGE WHATSOEVER. ***
 # *** IT IS NOT INTENDED TO BE USED TO TRADE LIVE WITH REAL MONEY. ***
@@ -65,6 +74,13 @@ class EMACrossBracketConfig(StrategyConfig, frozen=True):
     emulation_trigger : str, default 'NO_TRIGGER'
         The emulation trigger for submitting emulated orders.
         If ``None`` then orders will not be emulated.
+    catalog_path : str, optional
+        The data catalog holding the bars for `bar_type`. If set then the indicator
+        values are precomputed on start, over the requested historical bars and the
+        catalog bars still to come, instead of being updated bar by bar.
+    debug : bool, default False
+        If diagnostic messages should be printed on start, for historical data,
+        and for the first bar (and logged while the indicators warm up).
 
     """
 
@@ -78,6 +94,8 @@ class EMACrossBracketConfig(StrategyConfig, frozen=True):
     slow_ema_period: PositiveInt = 20
     bracket_distance_atr: PositiveFloat = 3.0
     emulation_trigger: str = "NO_TRIGGER"
+    catalog_path: str | None = None
+    debug: bool = False
 
 
 class EMACrossBracket(Strategy):
@@ -109,38 +127,59 @@ class EMACrossBracket(Strategy):
         super().__init__(config)
 
         self.instrument: Instrument | None = None  # Initialized in on_start
+        self._trade_qty: Quantity | None = None  # Initialized in on_start
+
+        # Order settings that are the same for every bracket
+        self._emulation_trigger = TriggerType[config.emulation_trigger]
+        self._expire_delta = timedelta(seconds=30)
 
         # Create the indicators for the strategy
         self.atr = AverageTrueRange(config.atr_period)
         self.fast_ema = ExponentialMovingAverage(config.fast_ema_period)
         self.slow_ema = ExponentialMovingAverage(config.slow_ema_period)
 
-        self.is_first_bar = False
+        # Precomputed indicator values, indexed by bar position (see `catalog_path`)
+        self._ts: np.ndarray | None = None
+        self._atr_arr: np.ndarray | None = None
+        self._signal: np.ndarray | None = None
+        self._warmup = max(
+            config.atr_period, config.fast_ema_period, config.slow_ema_period
+        )
+
+        # The first bar's diagnostics run once, then on_bar is the class method again
+        if config.debug:
+            self.on_bar = self._on_first_bar
 
     def on_start(self) -> None:
         """
         Actions to be performed on strategy start.
         """
-        print(f"start time: {self.clock.utc_now()}")
+        if self.config.debug:
+            print(f"start time: {self.clock.utc_now()}")
         self.instrument = self.cache.instrument(self.config.instrument_id)
         if self.instrument is None:
             self.log.error(f"Could not find instrument for {self.config.instrument_id}")
             self.stop()
             return
 
-        # Register the indicators for updating
-        self.register_indicator_for_bars(self.config.bar_type, self.atr)
-        self.register_indicator_for_bars(self.config.bar_type, self.fast_ema)
-        self.register_indicator_for_bars(self.config.bar_type, self.slow_ema)
+        # Order quantity, which is fixed for the whole run
+        self._trade_qty = self.instrument.make_qty(self.config.trade_size)
+
+        if self.config.catalog_path is None:
+            # Register the indicators for updating
+            self.register_indicator_for_bars(self.config.bar_type, self.atr)
+            self.register_indicator_for_bars(self.config.bar_type, self.fast_ema)
+            self.register_indicator_for_bars(self.config.bar_type, self.slow_ema)
 
         # Get historical data
-        historical_start_time = datetime.strptime(
-            self.config.historical_start_time, "%Y-%m-%d"
+        historical_start_time = datetime.fromisoformat(
+            self.config.historical_start_time
         ).replace(tzinfo=timezone.utc)
 
-        print(f"Historical start time: {historical_start_time}")
-        historical_start_time_ns = historical_start_time.timestamp() * 1_000_000_000
-        print(f"Historical start time (ns): {historical_start_time_ns}")
+        if self.config.debug:
+            print(f"Historical start time: {historical_start_time}")
+            historical_start_time_ns = historical_start_time.timestamp() * 1_000_000_000
+            print(f"Historical start time (ns): {historical_start_time_ns}")
 
         self.request_bars(
             self.config.bar_type,
@@ -148,12 +187,87 @@ class EMACrossBracket(Strategy):
             limit=1000,
         )
 
+        # Needs the historical bars, which are in the cache once requested
+        if self.config.catalog_path is not None:
+            self.precompute_indicators()
+
         # Subscribe to live data
         self.subscribe_bars(self.config.bar_type)
         self.subscribe_quote_ticks(self.config.instrument_id)
 
-        bars = self.cache.bars(self.config.bar_type)
-        print(f"INIT: Number of bars in cache: {len(bars)}")
+        if self.config.debug:
+            print(
+                f"INIT: Number of bars in cache: {self.cache.bar_count(self.config.bar_type)}"
+            )
+
+    def precompute_indicators(self) -> None:
+        """
+        Compute the indicator values for the bars still to come in one vectorized pass.
+
+        The values are computed over the same bars that registered indicators are
+        updated with: the requested historical bars in the cache, followed by every
+        bar from the current time on. A historical bar at the current time is also
+        received live, and is counted twice just as with registered indicators.
+        """
+        # Historical bars, oldest first (the cache holds the most recent bar first)
+        history = self.cache.bars(self.config.bar_type)[::-1]
+
+        # Bars still to come, with the needed columns read straight from parquet
+        # (no Bar objects)
+        catalog = ParquetDataCatalog(self.config.catalog_path)
+        table = read_bars_table(
+            catalog,
+            self.config.bar_type,
+            columns=["high", "low", "close", "ts_event", "ts_init"],
+        )
+        ts_init = table.column("ts_init").to_numpy()
+        table = table.slice(np.searchsorted(ts_init, self.clock.timestamp_ns()))
+
+        precision = self.instrument.price_precision
+        self._ts = table.column("ts_event").to_numpy()
+        high = np.concatenate(
+            [
+                [bar.high.as_double() for bar in history],
+                fixed_to_float(table.column("high"), precision),
+            ]
+        )
+        low = np.concatenate(
+            [
+                [bar.low.as_double() for bar in history],
+                fixed_to_float(table.column("low"), precision),
+            ]
+        )
+        close = np.concatenate(
+            [
+                [bar.close.as_double() for bar in history],
+                fixed_to_float(table.column("close"), precision),
+            ]
+        )
+
+        _, _, atr, signal = ema_atr_signal(
+            close,
+            high,
+            low,
+            self.fast_ema.alpha,
+            self.slow_ema.alpha,
+            self.config.atr_period,
+            self._warmup,
+        )
+        # Only the values for the bars still to come are looked up
+        self._atr_arr = atr[len(history) :]
+        self._signal = signal[len(history) :]
+
+    def bar_index(self, ts_event: int) -> int:
+        """
+        Return the position of the bar with the given `ts_event` in the precomputed
+        arrays, or -1 if there is no such bar.
+
+        A binary search over the sorted timestamps (O(log n), no scan of the cache).
+        """
+        i = int(np.searchsorted(self._ts, ts_event))
+        if i == len(self._ts) or self._ts[i] != ts_event:
+            return -1
+        return i
 
     def on_quote_tick(self, tick: QuoteTick) -> None:
         """
@@ -172,7 +286,8 @@ class EMACrossBracket(Strategy):
         """
         Actions to be performed when the strategy is running and receives historical data.
         """
-        print(f"[on_historical_data] Historical data received: {data}")
+        if self.config.debug:
+            print(f"[on_historical_data] Historical data received: {data}")
 
     def on_bar(self, bar: Bar) -> None:
         """
@@ -184,102 +299,138 @@ class EMACrossBracket(Strategy):
             The bar received.
 
         """
-        if not self.is_first_bar:
-            print(f"First bar timestamp init: {bar.ts_init}")
-            print(f"First bar timestamp event: {bar.ts_event}")
-
-            bars = self.cache.bars(self.config.bar_type)
-            print(f"First bar in cache timestamp init: {bars[0].ts_init}")
-            print(f"First bar in cache timestamp event: {bars[0].ts_event}")
-
-            print(f"last bar in cache timestamp init: {bars[-1].ts_init}")
-            print(f"last bar in cache timestamp event: {bars[-1].ts_event}")
-
-            print(f"number of bars in cache: {len(bars)}")
-
-            self.is_first_bar = True
-
         # Check if indicators ready
-        if not self.indicators_initialized():
-            self.log.info(
-                f"Waiting for indicators to warm up [{self.cache.bar_count(self.config.bar_type)}]",
-                color=LogColor.BLUE,
-            )
-            return  # Wait for indicators to warm up...
+        if self._ts is not None:
+            i = self.bar_index(bar.ts_event)
+            if i < 0:
+                self.log.warning(f"No precomputed indicator values for {bar}")
+                return
+            signal = self._signal[i]
+            if signal == 0:
+                return  # Wait for indicators to warm up...
+            atr = self._atr_arr[i]
+        else:
+            if not self.indicators_initialized():
+                if self.config.debug:
+                    self.log.info(
+                        f"Waiting for indicators to warm up [{self.cache.bar_count(self.config.bar_type)}]",
+                        color=LogColor.BLUE,
+                    )
+                return  # Wait for indicators to warm up...
+            signal = 1 if self.fast_ema.value >= self.slow_ema.value else -1
+            atr = self.atr.value
 
         if bar.is_single_price():
             # Implies no market information for this bar
             return
 
+        # Read once for the order logic below rather than per call
+        instrument_id = self.config.instrument_id
+
         # BUY LOGIC
-        if self.fast_ema.value >= self.slow_ema.value:
-            if self.portfolio.is_flat(self.config.instrument_id):
-                self.cancel_all_orders(self.config.instrument_id)
-                self.buy(bar)
-            elif self.portfolio.is_net_short(self.config.instrument_id):
-                self.close_all_positions(self.config.instrument_id)
-                self.cancel_all_orders(self.config.instrument_id)
-                self.buy(bar)
+        if signal > 0:
+            if self.portfolio.is_flat(instrument_id):
+                self.cancel_all_orders(instrument_id)
+                self.buy(bar, atr)
+            elif self.portfolio.is_net_short(instrument_id):
+                self.close_all_positions(instrument_id)
+                self.cancel_all_orders(instrument_id)
+                self.buy(bar, atr)
         # SELL LOGIC
-        elif self.fast_ema.value < self.slow_ema.value:
-            if self.portfolio.is_flat(self.config.instrument_id):
-                self.cancel_all_orders(self.config.instrument_id)
-                self.sell(bar)
-            elif self.portfolio.is_net_long(self.config.instrument_id):
-                self.close_all_positions(self.config.instrument_id)
-                self.cancel_all_orders(self.config.instrument_id)
-                self.sell(bar)
+        elif signal < 0:
+            if self.portfolio.is_flat(instrument_id):
+                self.cancel_all_orders(instrument_id)
+                self.sell(bar, atr)
+            elif self.portfolio.is_net_long(instrument_id):
+                self.close_all_positions(instrument_id)
+                self.cancel_all_orders(instrument_id)
+                self.sell(bar, atr)
+
+    def _on_first_bar(self, bar: Bar) -> None:
+        """
+        Print the first bar and cache diagnostics, then handle the bar as usual.
+        """
+        print(f"First bar timestamp init: {bar.ts_init}")
+        print(f"First bar timestamp event: {bar.ts_event}")
+
+        # Index the cache directly rather than copying its bars into a list
+        # (reverse indexed, most recent bar at index 0)
+        bar_count = self.cache.bar_count(self.config.bar_type)
+        first_bar = self.cache.bar(self.config.bar_type)
+        last_bar = self.cache.bar(self.config.bar_type, bar_count - 1)
+        print(f"First bar in cache timestamp init: {first_bar.ts_init}")
+        print(f"First bar in cache timestamp event: {first_bar.ts_event}")
+
+        print(f"last bar in cache timestamp init: {last_bar.ts_init}")
+        print(f"last bar in cache timestamp event: {last_bar.ts_event}")
+
+        print(f"number of bars in cache: {bar_count}")
+
+        del self.on_bar
+        self.on_bar(bar)
 
-    def buy(self, last_bar: Bar) -> None:
+    def bracket_prices(self, entry: Price, atr: float) -> tuple[Price, Price]:
         """
-        Users bracket buy method (example).
+        Return the (lower, upper) bracket prices around `entry`.
+
+        Each price is rounded to the instrument precision after the ATR distance is
+        applied, since rounding the distance first can land one tick off. The rounding
+        goes through ``make_price`` on the float value, as an integer offset of
+        ``entry.raw`` does not round the same way on every tick.
         """
-        if not self.instrument:
-            self.log.error("No instrument loaded")
-            return
+        bracket_distance: float = self.config.bracket_distance_atr * atr
+        price = entry.as_double()
+        return (
+            self.instrument.make_price(price - bracket_distance),
+            self.instrument.make_price(price + bracket_distance),
+        )
 
-        bracket_distance: float = self.config.bracket_distance_atr * self.atr.value
+    def buy(self, last_bar: Bar, atr: float) -> None:
+        """
+        Users bracket buy method (example).
+
+        Only called from ``on_bar``, which requires the instrument loaded in ``on_start``
+        (the strategy stops before subscribing to bars if it is missing).
+        """
+        entry = last_bar.close
+        lower, upper = self.bracket_prices(entry, atr)
         order_list: OrderList = self.order_factory.bracket(
             instrument_id=self.config.instrument_id,
             order_side=OrderSide.BUY,
-            quantity=self.instrument.make_qty(self.config.trade_size),
+            quantity=self._trade_qty,
             time_in_force=TimeInForce.GTD,
-            expire_time=self.clock.utc_now() + timedelta(seconds=30),
-            entry_price=self.instrument.make_price(last_bar.close),  # TODO
-            entry_trigger_price=self.instrument.make_price(last_bar.close),  # TODO
-            sl_trigger_price=self.instrument.make_price(
-                last_bar.close - bracket_distance
-            ),
-            tp_price=self.instrument.make_price(last_bar.close + bracket_distance),
+            expire_time=self.clock.utc_now() + self._expire_delta,
+            entry_price=entry,  # TODO
+            entry_trigger_price=entry,  # TODO
+            sl_trigger_price=lower,
+            tp_price=upper,
             entry_order_type=OrderType.LIMIT_IF_TOUCHED,
-            emulation_trigger=TriggerType[self.config.emulation_trigger],
+            emulation_trigger=self._emulation_trigger,
         )
 
         self.submit_order_list(order_list)
 
-    def sell(self, last_bar: Bar) -> None:
+    def sell(self, last_bar: Bar, atr: float) -> None:
         """
         Users bracket sell method (example).
-        """
-        if not self.instrument:
-            self.log.error("No instrument loaded")
-            return
 
-        bracket_distance: float = self.config.bracket_distance_atr * self.atr.value
+        Only called from ``on_bar``, which requires the instrument loaded in ``on_start``
+        (the strategy stops before subscribing to bars if it is missing).
+        """
+        entry = last_bar.close
+        lower, upper = self.bracket_prices(entry, atr)
         order_list: OrderList = self.order_factory.bracket(
             instrument_id=self.config.instrument_id,
             order_side=OrderSide.SELL,
-            quantity=self.instrument.make_qty(self.config.trade_size),
+            quantity=self._trade_qty,
             time_in_force=TimeInForce.GTD,
-            expire_time=self.clock.utc_now() + timedelta(seconds=30),
-            entry_price=self.instrument.make_price(last_bar.close),  # TODO
-            entry_trigger_price=self.instrument.make_price(last_bar.close),  # TODO
-            sl_trigger_price=self.instrument.make_price(
-                last_bar.close + bracket_distance
-            ),
-            tp_price=self.instrument.make_price(last_bar.close - bracket_distance),
+            expire_time=self.clock.utc_now() + self._expire_delta,
+            entry_price=entry,  # TODO
+            entry_trigger_price=entry,  # TODO
+            sl_trigger_price=upper,
+            tp_price=lower,
             entry_order_type=OrderType.LIMIT_IF_TOUCHED,
-            emulation_trigger=TriggerType[self.config.emulation_trigger],
+            emulation_trigger=self._emulation_trigger,
         )
 
         self.submit_order_list(order_list)
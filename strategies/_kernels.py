@@ -0,0 +1,54 @@
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def ema_atr_signal(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    alpha_fast: float,
+    alpha_slow: float,
+    atr_period: int,
+    warmup: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the fast EMA, slow EMA, ATR and EMA cross signal over whole price series.
+
+    The values match the ``ExponentialMovingAverage`` and ``AverageTrueRange``
+    (simple moving average of the true range) indicators updated bar by bar.
+    The signal is 1 when the fast EMA is at or above the slow EMA, -1 when it is
+    below, and 0 for the first `warmup` - 1 bars while the indicators warm up.
+
+    """
+    n = close.shape[0]
+    fast = np.empty(n, dtype=np.float64)
+    slow = np.empty(n, dtype=np.float64)
+    atr = np.empty(n, dtype=np.float64)
+    true_range = np.empty(n, dtype=np.float64)
+    signal = np.zeros(n, dtype=np.int8)
+    if n == 0:
+        return fast, slow, atr, signal
+
+    fast_value = close[0]
+    slow_value = close[0]
+    prev_close = close[0]
+    tr_sum = 0.0
+
+    for i in range(n):
+        fast_value = alpha_fast * close[i] + (1.0 - alpha_fast) * fast_value
+        slow_value = alpha_slow * close[i] + (1.0 - alpha_slow) * slow_value
+        fast[i] = fast_value
+        slow[i] = slow_value
+
+        true_range[i] = max(high[i], prev_close) - min(low[i], prev_close)
+        prev_close = close[i]
+        tr_sum += true_range[i]
+        if i >= atr_period:
+            tr_sum -= true_range[i - atr_period]
+        atr[i] = tr_sum / min(i + 1, atr_period)
+
+        if i + 1 >= warmup:
+            signal[i] = 1 if fast_value >= slow_value else -1
+
+    return fast, slow, atr, signal
@@ -0,0 +1,49 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from nautilus_trader.model.objects import Price
+from utils import catalog
+
+
+VALUES = np.array([42_000.12, 0.01, 1.005, 99_999.99])
+
+
+def test_to_fixed_binary_16_bytes(monkeypatch):
+    monkeypatch.setattr(catalog, "FIXED_PRECISION", 16)
+    monkeypatch.setattr(catalog, "FIXED_PRECISION_BYTES", 16)
+
+    array = catalog._to_fixed_binary(VALUES, 2)
+
+    raws = [int.from_bytes(value, "little", signed=True) for value in array.to_pylist()]
+    assert raws == [round(value * 100) * 10**14 for value in VALUES]
+    decoded = catalog.fixed_to_float(pa.chunked_array([array]), 2)
+    assert decoded.tolist() == [round(value * 100) / 100 for value in VALUES]
+
+
+def test_to_fixed_binary_8_bytes(monkeypatch):
+    monkeypatch.setattr(catalog, "FIXED_PRECISION", 9)
+    monkeypatch.setattr(catalog, "FIXED_PRECISION_BYTES", 8)
+
+    array = catalog._to_fixed_binary(VALUES, 2)
+
+    raws = np.frombuffer(b"".join(array.to_pylist()), dtype="<i8")
+    assert raws.tolist() == [round(value * 100) * 10**7 for value in VALUES]
+    decoded = catalog.fixed_to_float(pa.chunked_array([array]), 2)
+    assert decoded.tolist() == [round(value * 100) * 10**7 / 1e9 for value in VALUES]
+
+
+def test_to_fixed_binary_matches_price_raw():
+    array = catalog._to_fixed_binary(VALUES, 2)
+
+    raws = [int.from_bytes(value, "little", signed=True) for value in array.to_pylist()]
+    assert raws == [Price(value, 2).raw for value in VALUES]
+    decoded = catalog.fixed_to_float(pa.chunked_array([array]), 2)
+    assert decoded.tolist() == [Price(value, 2).as_double() for value in VALUES]
+
+
+def test_to_fixed_binary_unsupported_width(monkeypatch):
+    monkeypatch.setattr(catalog, "FIXED_PRECISION_BYTES", 4)
+
+    with pytest.raises(ValueError):
+        catalog._to_fixed_binary(VALUES, 2)
@@ -1,12 +1,216 @@
 import aiohttp
 import asyncio
+import email.utils
+import functools
+import hashlib
+import json
+import logging
 import zipfile
-import io
+import os
+import random
+import shutil
+import struct
+import tempfile
+import zlib
 from pathlib import Path
-from datetime import datetime, timedelta, date
+from typing import BinaryIO
+from datetime import datetime, timedelta, date, timezone
 import argparse
-import re
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Project root directory (2 levels up from this file), data paths are relative to it
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Kline columns needed to build bars, parsed with fixed types (no type inference)
+KLINE_SCHEMA = pa.schema(
+    [
+        ("open_time", pa.int64()),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.float64()),
+    ]
+)
+
+# Downloaded CSVs are kept zstd-compressed. Arrow detects the compression from the
+# extension, and recognizes ".zstd" but not ".zst"
+CSV_SUFFIX = ".csv.zstd"
+
+# Cached listing of a data directory, kept next to it, see list_data_files
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Some filesystems store modification times to the nearest 1-2 s, so a change
+# within that long of a listing may leave the directory's time unchanged
+MANIFEST_SAFETY_NS = 3_000_000_000
+
+# Fixed-size start of a zip local file header (signature, version, flags, method,
+# time, date, CRC-32, compressed size, uncompressed size, name and extra lengths)
+LOCAL_FILE_HEADER = struct.Struct("<4sHHHHHIIIHH")
+
+# HTTP statuses of failed downloads that are retried
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Shared HTTP session (and the event loop it belongs to), see get_session
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+async def get_session(max_concurrent_downloads: int = 10) -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session, creating it on first use.
+
+    Reusing one session keeps DNS results and keep-alive TLS connections to the
+    data host warm across downloads. A new session is created if the previous one
+    was closed or belongs to another event loop (e.g. an earlier asyncio.run).
+    Call close_session once done downloading.
+
+    Args:
+        max_concurrent_downloads: Connection limit for a newly created session
+
+    Returns:
+        The shared session
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=max_concurrent_downloads,
+            limit_per_host=max_concurrent_downloads,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            # No cap on the whole download, as large archives can take minutes on
+            # a slow link. A stalled connection still fails on the read timeout
+            timeout=aiohttp.ClientTimeout(total=None, connect=10, sock_read=60),
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session():
+    """
+    Close the shared HTTP session, if open.
+    """
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+def month_end(day: date) -> date:
+    """
+    Get the last day of the month containing the given day.
+    """
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def file_prefix(
+    symbol: str, data_type: str = "klines", interval: str | None = None
+) -> str:
+    """
+    Get the start of the Binance file names, up to the day or month.
+    """
+    if data_type == "klines":
+        return f"{symbol}-{interval}-"
+    return f"{symbol}-"
+
+
+def file_stem(
+    symbol: str, period: str, data_type: str = "klines", interval: str | None = None
+) -> str:
+    """
+    Get the Binance file name (without extension) for a day (YYYY-MM-DD) or month (YYYY-MM).
+    """
+    return file_prefix(symbol, data_type, interval) + period
+
+
+@functools.lru_cache(maxsize=64)
+def data_subpath(
+    timeframe: str,
+    instrument: str,
+    market: str,
+    data_type: str,
+    symbol: str,
+    interval: str | None = None,
+) -> str:
+    """
+    Get the relative directory of a dataset, following the Binance directory structure.
+
+    Args:
+        timeframe: Archive timeframe ('daily' or 'monthly')
+        instrument: Instrument type (e.g. 'futures')
+        market: Market (e.g. 'um')
+        data_type: Type of data ('klines' or 'bookTicker')
+        symbol: Trading pair
+        interval: Kline interval (klines only)
+
+    Returns:
+        Relative path with a trailing slash, for joining to a local directory or base URL
+    """
+    path = f"{instrument}/{market}/{timeframe}/{data_type}/{symbol}/"
+    if data_type == "klines" and interval:
+        path += f"{interval}/"
+    return path
+
+
+def list_data_files(local_path: Path) -> list[str]:
+    """
+    List the file names in a data directory, through a manifest kept next to it.
+
+    Listing a directory of thousands of files is slow on network filesystems, so
+    the names are saved to a manifest along with the directory's modification time.
+    Adding, removing or renaming a file changes that time, and only then is the
+    directory scanned again. A manifest written within MANIFEST_SAFETY_NS of the
+    directory's last change is not trusted, as a later change could have left the
+    time unchanged.
+
+    Args:
+        local_path: Path to the directory containing data files
+
+    Returns:
+        Names of the files in the directory, empty if it doesn't exist
+    """
+    try:
+        dir_mtime = os.stat(local_path).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    # Kept outside the directory, so writing it doesn't change the directory's time
+    manifest_path = local_path.with_name(local_path.name + MANIFEST_SUFFIX)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+            # Compared with the directory's time, so both come from the same clock
+            written = os.fstat(f.fileno()).st_mtime_ns
+        if (
+            manifest["dir_mtime_ns"] == dir_mtime
+            and written - dir_mtime >= MANIFEST_SAFETY_NS
+        ):
+            return manifest["files"]
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        pass
+
+    with os.scandir(local_path) as entries:
+        names = sorted(entry.name for entry in entries)
+    part_path = manifest_path.with_name(manifest_path.name + ".part")
+    try:
+        with open(part_path, "w") as f:
+            json.dump({"dir_mtime_ns": dir_mtime, "files": names}, f)
+        os.replace(part_path, manifest_path)
+    except OSError as e:
+        logger.debug("Could not write the manifest for %s: %s", local_path, e)
+    return names
 
 
 def get_existing_dates(
@@ -25,57 +229,331 @@ def get_existing_dates(
     Returns:
         Set of dates for which data files exist
     """
-    # Ensure local_path is absolute
-    local_path = Path(local_path).resolve()
-
-    if data_type == "klines":
-        if not interval:
-            raise ValueError("interval is required for klines data_type")
-        pattern = re.compile(
-            rf"^{re.escape(symbol)}-{re.escape(interval)}-(\d{{4}}-\d{{2}}-\d{{2}})\.csv$"
-        )
-        glob_pattern = f"{symbol}-{interval}-*.csv"
-    else:
-        pattern = re.compile(rf"^{re.escape(symbol)}-(\d{{4}}-\d{{2}}-\d{{2}})\.csv$")
-        glob_pattern = f"{symbol}-*.csv"
+    if data_type == "klines" and not interval:
+        raise ValueError("interval is required for klines data_type")
+    prefix = file_prefix(symbol, data_type, interval)
+    suffix = CSV_SUFFIX
+    # The names are fixed-format, so the date is sliced out rather than regex matched
+    name_length = len(prefix) + len("YYYY-MM-DD") + len(suffix)
 
     existing_dates = set()
-    for file in local_path.glob(glob_pattern):
-        match = pattern.match(file.name)
-        if match:
+    for name in list_data_files(local_path):
+        if (
+            len(name) == name_length
+            and name.startswith(prefix)
+            and name.endswith(suffix)
+        ):
             try:
-                date_obj = datetime.strptime(match.group(1), "%Y-%m-%d").date()
-                existing_dates.add(date_obj)
-            except Exception:
+                existing_dates.add(date.fromisoformat(name[len(prefix) : -len(suffix)]))
+            except ValueError:
                 pass
-        else:
-            print(f"Pattern did not match: {pattern.pattern}")  # Debug print
     return existing_dates
 
 
-async def download_and_save_csv(session, url, out_path, filename, semaphore, retries=3):
-    async with semaphore:
-        for attempt in range(1, retries + 1):
+def get_existing_days_mask(
+    local_path: Path,
+    start: date,
+    end: date,
+    data_type: str = "klines",
+    interval: str | None = None,
+    symbol: str = "",
+) -> np.ndarray:
+    """
+    Get which days of a date range have a data file, as a boolean array.
+
+    Args:
+        local_path: Path to the directory containing data files
+        start: First day of the range
+        end: Last day of the range, inclusive
+        data_type: Type of data ('klines' or other)
+        interval: Kline interval (klines only)
+        symbol: Trading pair
+
+    Returns:
+        Array with one entry per day from start to end, True where the day's file exists
+    """
+    start_ordinal = start.toordinal()
+    present = np.zeros(end.toordinal() - start_ordinal + 1, dtype=np.bool_)
+    for day in get_existing_dates(local_path, data_type, interval, symbol):
+        i = day.toordinal() - start_ordinal
+        if 0 <= i < len(present):
+            present[i] = True
+    return present
+
+
+def open_csv_output(path: Path) -> pa.NativeFile:
+    """
+    Open a file to write a CSV to, compressing it with zstd as it is written.
+    """
+    return pa.CompressedOutputStream(str(path), "zstd")
+
+
+def extract_csv(archive: BinaryIO, out_path: Path) -> None:
+    """
+    Stream the CSV in a Binance zip archive to a file.
+
+    The CSV is written under a temporary name and renamed once complete, so a failed
+    write never leaves a partial file that looks complete.
+
+    Args:
+        archive: Seekable file object holding the zip archive
+        out_path: Path to write the CSV to
+    """
+    part_path = out_path.with_name(out_path.name + ".part")
+    with zipfile.ZipFile(archive) as zip_file:
+        csv_info = zip_file.infolist()[0]
+        with zip_file.open(csv_info) as csv_file, open_csv_output(part_path) as f:
+            shutil.copyfileobj(csv_file, f, 1 << 20)
+    os.replace(part_path, out_path)
+
+
+async def stream_csv(content: aiohttp.StreamReader, out_path: Path) -> None:
+    """
+    Inflate the CSV in a Binance zip archive straight from a response body to a file.
+
+    Binance archives hold a single deflated CSV, so the zip local file header is
+    parsed and the member data is fed through zlib as it arrives, without buffering
+    the archive. Archives laid out any other way are spooled and extracted with
+    zipfile instead.
+
+    Args:
+        content: Response body stream, positioned at the start of the archive
+        out_path: Path to write the CSV to
+    """
+    header = await content.readexactly(LOCAL_FILE_HEADER.size)
+    signature, _, flags, method, _, _, crc, _, size, name_length, extra_length = (
+        LOCAL_FILE_HEADER.unpack(header)
+    )
+    if signature != b"PK\x03\x04" or method != zipfile.ZIP_DEFLATED or flags & 0x1:
+        # Spool the archive (to disk past 8 MB) so zipfile can seek in it
+        with tempfile.SpooledTemporaryFile(max_size=8 << 20) as archive:
+            archive.write(header)
+            async for chunk in content.iter_chunked(1 << 16):
+                archive.write(chunk)
+            archive.seek(0)
+            await asyncio.to_thread(extract_csv, archive, out_path)
+        return
+
+    # With a data descriptor (flag bit 3) the CRC-32 and sizes follow the data
+    # instead of being in the header, and the header fields are 0
+    has_descriptor = flags & 0x8
+    # 0xFFFFFFFF means the size is in a zip64 extra field, which isn't parsed
+    size_known = not has_descriptor and size != 0xFFFFFFFF
+
+    await content.readexactly(name_length + extra_length)
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    part_path = out_path.with_name(out_path.name + ".part")
+    csv_crc = 0
+    csv_size = 0
+    trailer = b""
+
+    def write(f: pa.NativeFile, chunk: bytes) -> None:
+        nonlocal csv_crc, csv_size, trailer
+        if not decompressor.eof:
+            data = decompressor.decompress(chunk)
+            csv_crc = zlib.crc32(data, csv_crc)
+            csv_size += len(data)
+            f.write(data)
+            trailer = decompressor.unused_data
+        elif len(trailer) < 16:
+            trailer += chunk
+
+    try:
+        with open_csv_output(part_path) as f:
+            # Inflating, compressing and writing run in a worker thread so they
+            # don't block the event loop, while the connection keeps buffering the
+            # body. Read to the end of the body even after the CSV is complete, so
+            # the connection can be reused
+            writing = None
             try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
-                            csv_name = zip_file.namelist()[0]
-                            with zip_file.open(csv_name) as csv_file:
-                                with open(out_path, "wb") as f:
-                                    f.write(csv_file.read())
-                        print(f"Downloaded and saved {filename}")
-                        return True
-                    else:
-                        print(f"Failed to download {filename}: {response.status}")
-            except Exception as e:
-                print(f"Error downloading {filename} (attempt {attempt}): {e}")
-            await asyncio.sleep(1)  # brief pause before retry
-        print(f"Giving up on {filename} after {retries} attempts.")
+                async for chunk in content.iter_chunked(1 << 16):
+                    writing = asyncio.ensure_future(asyncio.to_thread(write, f, chunk))
+                    await asyncio.shield(writing)
+            finally:
+                # The file can't be closed while the worker is still writing to it
+                if writing is not None and not writing.done():
+                    await asyncio.wait([writing])
+            if not decompressor.eof:
+                raise EOFError("Archive ended before the end of the CSV")
+
+        # Verify the CSV against the archive, so a corrupted download is retried
+        # rather than saved
+        if has_descriptor:
+            if trailer.startswith(b"PK\x07\x08"):  # Optional descriptor signature
+                trailer = trailer[4:]
+            (crc,) = struct.unpack_from("<I", trailer)
+        if csv_crc != crc:
+            raise ValueError(f"CRC-32 mismatch ({csv_crc:08x} != {crc:08x})")
+        if size_known and csv_size != size:
+            raise ValueError(f"Size mismatch ({csv_size} != {size} bytes)")
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    os.replace(part_path, out_path)
+
+
+def retry_delay(
+    attempt: int,
+    retry_after: str | None = None,
+    base: float = 1.0,
+    cap: float = 60.0,
+) -> float:
+    """
+    Get how long to wait before retrying a failed download.
+
+    Args:
+        attempt: Number of the attempt that failed (from 1)
+        retry_after: Retry-After header of the response, if any (seconds or HTTP date)
+        base: Delay after the first attempt, doubled after each further attempt
+        cap: Maximum backoff delay (a Retry-After from the server is always honored)
+
+    Returns:
+        Delay in seconds
+    """
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    # Exponential backoff with jitter, so concurrent retries don't line up
+    return min(cap, base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+async def download_and_save_csv(session, url, out_path, filename, retries=5):
+    for attempt in range(1, retries + 1):
+        retry_after = None
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    await stream_csv(response.content, out_path)
+                    logger.info("Downloaded and saved %s", filename)
+                    return True
+                logger.warning("Failed to download %s: %s", filename, response.status)
+                # Only rate limiting and server errors are worth retrying, anything
+                # else (e.g. 404 for a day that doesn't exist) won't change
+                if response.status not in RETRY_STATUSES:
+                    return False
+                retry_after = response.headers.get("Retry-After")
+        except Exception as e:
+            logger.warning(
+                "Error downloading %s (attempt %d): %s", filename, attempt, e
+            )
+        if attempt < retries:
+            await asyncio.sleep(retry_delay(attempt, retry_after))
+    logger.error("Giving up on %s after %d attempts.", filename, retries)
     return False
 
 
+async def download_files(
+    session: aiohttp.ClientSession,
+    fetches: list[tuple[str, Path]],
+    max_concurrent_downloads: int = 10,
+) -> list[bool]:
+    """
+    Download and extract archives with a fixed pool of workers.
+
+    Only max_concurrent_downloads downloads run at once and at most twice as many
+    wait in the queue, rather than creating a task per file up front.
+
+    Args:
+        session: HTTP session to download with
+        fetches: (remote_url, local_csv) pairs to download
+        max_concurrent_downloads: Number of workers
+
+    Returns:
+        Whether each download succeeded, in the order of fetches
+    """
+    results = [False] * len(fetches)
+    queue = asyncio.Queue(maxsize=2 * max_concurrent_downloads)
+
+    async def worker():
+        while (item := await queue.get()) is not None:
+            i, url, out_path = item
+            filename = url.rsplit("/", 1)[1]
+            results[i] = await download_and_save_csv(session, url, out_path, filename)
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(min(max_concurrent_downloads, len(fetches)))
+    ]
+    for i, (url, out_path) in enumerate(fetches):
+        await queue.put((i, url, out_path))
+    for _ in workers:
+        await queue.put(None)  # One stop sentinel per worker
+    await asyncio.gather(*workers)
+    return results
+
+
+def _plan_fetches(
+    symbol: str,
+    start: date,
+    end: date,
+    data_type: str,
+    interval: str | None,
+    local_paths: dict[str, Path],
+    remote_paths: dict[str, str],
+    monthly: bool = True,
+) -> list[tuple[str, Path, list[date]]]:
+    """
+    Plan the downloads needed to cover the dates from start to end.
+
+    Dates already on disk, as a daily file or within a monthly file, are skipped.
+    Missing dates in a month that has ended are fetched as one monthly archive when
+    monthly is set, the rest (e.g. the current month) are fetched per day.
+
+    Returns:
+        List of (remote_url, local_csv, dates) tuples, one per file to download
+    """
+    present = get_existing_days_mask(
+        local_path=local_paths["daily"],
+        start=start,
+        end=end,
+        data_type=data_type,
+        interval=interval,
+        symbol=symbol,
+    )
+
+    missing: dict[date, list[date]] = {}
+    for i in np.flatnonzero(~present):
+        day = date.fromordinal(start.toordinal() + int(i))
+        missing.setdefault(day.replace(day=1), []).append(day)
+
+    today = datetime.now(timezone.utc).date()
+    # The daily names are built by concatenating the date onto fixed prefixes, as
+    # there can be thousands of them
+    prefix = file_prefix(symbol, data_type, interval)
+    daily_url_prefix = remote_paths["daily"] + prefix
+    fetches = []
+    for month, dates in missing.items():
+        stem = file_stem(symbol, month.isoformat()[:7], data_type, interval)
+        if (local_paths["monthly"] / f"{stem}{CSV_SUFFIX}").exists():
+            continue
+        if monthly and month_end(month) < today:
+            fetches.append(
+                (
+                    f"{remote_paths['monthly']}{stem}.zip",
+                    local_paths["monthly"] / f"{stem}{CSV_SUFFIX}",
+                    dates,
+                )
+            )
+            continue
+        for day in dates:
+            day_str = day.isoformat()
+            fetches.append(
+                (
+                    daily_url_prefix + day_str + ".zip",
+                    local_paths["daily"] / (prefix + day_str + CSV_SUFFIX),
+                    [day],
+                )
+            )
+    return fetches
+
+
 async def download_binance_data(
     symbol: str,
     start_date: str,
@@ -83,7 +561,7 @@ async def download_binance_data(
     base_url: str = "https://data.binance.vision/data/",
     instrument: str = "futures",
     market: str = "um",
-    timeframe: str = "daily",
+    timeframe: str = "monthly",
     data_type: str = "klines",
     interval: str | None = None,
     output_dir: str = "data/binance/",  # This will be relative to project root
@@ -91,82 +569,207 @@ async def download_binance_data(
 ):
     """
     Download Binance data for a specific symbol and timeframe asynchronously, mirroring the Binance API directory structure.
+
+    With the 'monthly' timeframe, whole months are fetched as monthly archives (one
+    request instead of one per day) and only the current month is fetched per day.
+    Klines only, other data types always use daily archives.
     """
     if data_type not in ("klines", "bookTicker"):
         raise ValueError("data_type must be 'klines' or 'bookTicker'")
     if data_type == "klines" and not interval:
         raise ValueError("interval is required for klines data_type")
+    if timeframe not in ("daily", "monthly"):
+        raise ValueError("timeframe must be 'daily' or 'monthly'")
 
-    # Get the project root directory (2 levels up from the script)
-    project_root = Path(__file__).parent.parent
-    output_path = project_root / output_dir
+    output_path = PROJECT_ROOT / output_dir
 
-    # Build local and remote paths
-    if data_type == "klines" and interval:
-        local_path = (
-            output_path
-            / instrument
-            / market
-            / timeframe
-            / data_type
-            / symbol
-            / interval
-        )
-        remote_path = f"{base_url}{instrument}/{market}/{timeframe}/{data_type}/{symbol}/{interval}/"
-    else:
-        local_path = output_path / instrument / market / timeframe / data_type / symbol
-        remote_path = (
-            f"{base_url}{instrument}/{market}/{timeframe}/{data_type}/{symbol}/"
-        )
-    local_path.mkdir(parents=True, exist_ok=True)
+    # Build local and remote paths for both timeframes
+    local_paths = {}
+    remote_paths = {}
+    for tf in ("daily", "monthly"):
+        subpath = data_subpath(tf, instrument, market, data_type, symbol, interval)
+        local_paths[tf] = output_path / subpath
+        remote_paths[tf] = f"{base_url}{subpath}"
 
     # Parse dates
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
 
-    existing_dates = get_existing_dates(
-        local_path=local_path,
+    # Step 1: Plan the files to download (only for missing dates)
+    fetches = _plan_fetches(
+        symbol=symbol,
+        start=start,
+        end=end,
+        data_type=data_type,
+        interval=interval,
+        local_paths=local_paths,
+        remote_paths=remote_paths,
+        monthly=timeframe == "monthly" and data_type == "klines",
+    )
+    if not fetches:
+        return
+
+    # Step 2: Download the files, falling back to daily archives for any month
+    # whose monthly archive could not be fetched (e.g. not yet published)
+    session = await get_session(max_concurrent_downloads)
+    while fetches:
+        for directory in {out_path.parent for _, out_path, _ in fetches}:
+            directory.mkdir(parents=True, exist_ok=True)
+        results = await download_files(
+            session,
+            [(url, out_path) for url, out_path, _ in fetches],
+            max_concurrent_downloads,
+        )
+        failed_months = [
+            dates
+            for (_, out_path, dates), ok in zip(fetches, results)
+            if not ok and out_path.parent == local_paths["monthly"]
+        ]
+        fetches = [
+            fetch
+            for dates in failed_months
+            for fetch in _plan_fetches(
+                symbol=symbol,
+                start=dates[0],
+                end=dates[-1],
+                data_type=data_type,
+                interval=interval,
+                local_paths=local_paths,
+                remote_paths=remote_paths,
+                monthly=False,
+            )
+        ]
+    logger.info("Download complete.")
+
+
+def klines_dataset(
+    data_path: Path,
+    symbol: str,
+    interval: str,
+    start_date: str,
+    end_date: str,
+    instrument: str = "futures",
+    market: str = "um",
+    data_type: str = "klines",
+) -> ds.Dataset:
+    """
+    Open the downloaded klines for a date range as a lazy Arrow dataset.
+
+    Args:
+        data_path: Local data directory the files were downloaded to
+        symbol: Trading pair
+        interval: Kline interval
+        start_date: First date (YYYY-MM-DD)
+        end_date: Last date (YYYY-MM-DD), inclusive
+        instrument: Instrument type (e.g. 'futures')
+        market: Market (e.g. 'um')
+        data_type: Type of data
+
+    Returns:
+        Dataset of the KLINE_SCHEMA columns over the CSVs, in time order
+    """
+    # Find the CSVs covering the date range, month by month. A month is read from
+    # its monthly file when there is one, otherwise from its daily files
+    local_paths = {
+        tf: data_path
+        / data_subpath(tf, instrument, market, data_type, symbol, interval)
+        for tf in ("daily", "monthly")
+    }
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    present = get_existing_days_mask(
+        local_path=local_paths["daily"],
+        start=start,
+        end=end,
         data_type=data_type,
         interval=interval,
         symbol=symbol,
     )
+    daily_prefix = os.path.join(
+        local_paths["daily"], file_prefix(symbol, data_type, interval)
+    )
+    csv_paths = []
+    month = start.replace(day=1)
+    while month <= end:
+        stem = file_stem(symbol, month.isoformat()[:7], data_type, interval)
+        month_path = local_paths["monthly"] / f"{stem}{CSV_SUFFIX}"
+        if month_path.exists():
+            csv_paths.append(str(month_path))
+        else:
+            day = max(start, month)
+            while day <= min(end, month_end(month)):
+                file_path = daily_prefix + day.isoformat() + CSV_SUFFIX
+                if present[(day - start).days]:
+                    csv_paths.append(file_path)
+                else:
+                    logger.warning("%s does not exist, skipping.", file_path)
+                day += timedelta(days=1)
+        month = month_end(month) + timedelta(days=1)
 
-    # Step 1: Prepare list of dates to download (only missing ones)
-    missing_dates = []
-    date = start
-    while date <= end:
-        if date not in existing_dates:
-            missing_dates.append(date)
-        date += timedelta(days=1)
+    if not csv_paths:
+        raise ValueError("No data found, exiting.")
 
-    if not missing_dates:
-        return
+    # The files are parsed by the multithreaded C++ CSV reader, only the typed kline
+    # columns. Monthly files can extend past the date range, so the dataset is
+    # filtered to it and the rows outside are dropped during any scan
+    start_ms = int(
+        datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp()
+        * 1000
+    )
+    end_ms = start_ms + ((end - start).days + 1) * 86_400_000
+    dataset = ds.dataset(
+        csv_paths,
+        format=ds.CsvFileFormat(
+            convert_options=pv.ConvertOptions(column_types=KLINE_SCHEMA)
+        ),
+        schema=KLINE_SCHEMA,
+    )
+    open_time = ds.field("open_time")
+    return dataset.filter((open_time >= start_ms) & (open_time < end_ms))
 
-    # Step 2: Download missing days (in memory)
-    semaphore = asyncio.Semaphore(max_concurrent_downloads)
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for date in missing_dates:
-            date_str = date.strftime("%Y-%m-%d")
-            if data_type == "klines":
-                filename = f"{symbol}-{interval}-{date_str}.zip"
-                out_filename = f"{symbol}-{interval}-{date_str}.csv"
-            else:
-                filename = f"{symbol}-{date_str}.zip"
-                out_filename = f"{symbol}-{date_str}.csv"
-            url = f"{remote_path}{filename}"
-            out_path = local_path / out_filename
-            if out_path.exists():
-                continue
-            tasks.append(
-                download_and_save_csv(session, url, out_path, filename, semaphore)
-            )
-        if tasks:
-            await asyncio.gather(*tasks)
-    print("Download complete.")
 
+def read_klines(
+    dataset: ds.Dataset, cache_dir: Path, cache_prefix: str
+) -> pd.DataFrame:
+    """
+    Read a klines dataset into a DataFrame, through a parquet cache.
 
-async def get_combined_dataframe(
+    Args:
+        dataset: Dataset returned by `klines_dataset`
+        cache_dir: Directory to keep the cached results in
+        cache_prefix: Name prefix of the cache file for this dataset's range
+
+    Returns:
+        DataFrame with the KLINE_SCHEMA columns, in time order
+    """
+    # Reuse the result of an earlier call over the same files, cached as parquet.
+    # The cache key covers the range and each file's name, size and modification
+    # time, so new or re-downloaded files invalidate it
+    fingerprint = hashlib.blake2b(cache_prefix.encode(), digest_size=8)
+    for path in dataset.files:
+        stat = os.stat(path)
+        name = os.path.basename(path)
+        fingerprint.update(f"/{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    cache_path = cache_dir / f"{cache_prefix}-{fingerprint.hexdigest()}.parquet"
+    if cache_path.exists():
+        table = pq.read_table(cache_path)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    table = dataset.to_table()
+
+    # Write the cache, replacing any for this range built from older files
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for stale in cache_dir.glob(f"{cache_prefix}-*.parquet"):
+        stale.unlink()
+    part_path = cache_path.with_name(cache_path.name + ".part")
+    pq.write_table(table, part_path, compression="zstd")
+    os.replace(part_path, cache_path)
+
+    # Convert in one pass, releasing the Arrow buffers as the columns are converted
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+async def get_combined_dataset(
     symbol: str,
     interval: str,
     start_date: str,
@@ -174,13 +777,19 @@ async def get_combined_dataframe(
     data_dir: str = "data/binance/",  # This will be relative to project root
     instrument: str = "futures",
     market: str = "um",
-    timeframe: str = "daily",
+    timeframe: str = "monthly",
     data_type: str = "klines",
     max_concurrent_downloads: int = 10,
-) -> pd.DataFrame:
-    # Get the project root directory
-    project_root = Path(__file__).parent.parent
-    data_path = project_root / data_dir
+) -> ds.Dataset:
+    """
+    Download the klines for a date range if needed, and open them as a lazy dataset.
+
+    Nothing is read until the dataset is scanned. Columns and filters passed to
+    ``to_table`` / ``scanner`` are applied during the scan, so only the selected
+    columns are converted and only the matching rows are materialized, e.g.
+    ``dataset.to_table(columns=["open_time", "close"], filter=ds.field("open_time") >= ts)``.
+    """
+    data_path = PROJECT_ROOT / data_dir
 
     # Step 1: Ensure all files are present (download if needed)
     await download_binance_data(
@@ -199,28 +808,54 @@ async def get_combined_dataframe(
         max_concurrent_downloads=max_concurrent_downloads,
     )
 
-    # Step 2: Combine daily CSVs into a DataFrame
-    local_path = (
-        data_path / instrument / market / timeframe / data_type / symbol / interval
+    # Step 2: Open the files as one dataset. Listing them touches the filesystem,
+    # so it runs in a worker thread
+    return await asyncio.to_thread(
+        klines_dataset,
+        data_path=data_path,
+        symbol=symbol,
+        interval=interval,
+        start_date=start_date,
+        end_date=end_date,
+        instrument=instrument,
+        market=market,
+        data_type=data_type,
     )
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    dfs = []
-    date = start
-    while date <= end:
-        date_str = date.strftime("%Y-%m-%d")
-        filename = f"{symbol}-{interval}-{date_str}.csv"
-        file_path = local_path / filename
-        if file_path.exists():
-            dfs.append(pd.read_csv(file_path))
-        else:
-            print(f"Warning: {file_path} does not exist, skipping.")
-        date += timedelta(days=1)
 
-    if not dfs:
-        raise ValueError("No data found, exiting.")
 
-    return pd.concat(dfs, ignore_index=True)
+async def get_combined_dataframe(
+    symbol: str,
+    interval: str,
+    start_date: str,
+    end_date: str,
+    data_dir: str = "data/binance/",  # This will be relative to project root
+    instrument: str = "futures",
+    market: str = "um",
+    timeframe: str = "monthly",
+    data_type: str = "klines",
+    max_concurrent_downloads: int = 10,
+) -> pd.DataFrame:
+    dataset = await get_combined_dataset(
+        symbol=symbol,
+        interval=interval,
+        start_date=start_date,
+        end_date=end_date,
+        data_dir=data_dir,
+        instrument=instrument,
+        market=market,
+        timeframe=timeframe,
+        data_type=data_type,
+        max_concurrent_downloads=max_concurrent_downloads,
+    )
+
+    # Read the dataset into a DataFrame. The reads and parsing run in a worker
+    # thread so they don't block the event loop
+    return await asyncio.to_thread(
+        read_klines,
+        dataset,
+        cache_dir=PROJECT_ROOT / data_dir / "cache",
+        cache_prefix=file_stem(symbol, f"{start_date}_{end_date}", data_type, interval),
+    )
 
 
 if __name__ == "__main__":
@@ -235,9 +870,16 @@ if __name__ == "__main__":
     parser.add_argument(
         "--end_date",
         type=str,
-        default=datetime.now().strftime("%Y-%m-%d"),
+        default=date.today().isoformat(),
         help="End date (YYYY-MM-DD), defaults to today",
     )
+    parser.add_argument(
+        "--timeframe",
+        type=str,
+        default="monthly",
+        choices=["daily", "monthly"],
+        help="Archive timeframe (monthly falls back to daily for the current month)",
+    )
     parser.add_argument(
         "--output_dir", type=str, default="data/binance/", help="Output directory"
     )
@@ -250,13 +892,26 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    asyncio.run(
-        download_binance_data(
-            symbol=args.symbol,
-            start_date=args.start_date,
-            end_date=args.end_date,
-            output_dir=args.output_dir,
-            max_concurrent_downloads=args.max_concurrent_downloads,
-            interval=args.interval,
-        )
-    )
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    async def download():
+        try:
+            await download_binance_data(
+                symbol=args.symbol,
+                start_date=args.start_date,
+                end_date=args.end_date,
+                timeframe=args.timeframe,
+                output_dir=args.output_dir,
+                max_concurrent_downloads=args.max_concurrent_downloads,
+                interval=args.interval,
+            )
+        finally:
+            await close_session()
+
+    # uvloop (libuv) has less per-callback overhead than the default event loop
+    try:
+        import uvloop
+    except ImportError:  # uvloop is optional, e.g. it isn't available on Windows
+        asyncio.run(download())
+    else:
+        uvloop.run(download())